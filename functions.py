@@ -1,6 +1,7 @@
 import pygame
 from typing import List, Tuple
 import csv
+import struct
 import time
 from pathlib import Path
 
@@ -50,6 +51,23 @@ ROTATION_STATES = {
     ],
 }
 HS_PATH = Path("high_scores.csv")
+TELEMETRY_PATH = Path("telemetry.bin")
+
+# Telemetry log layout: a 4-byte magic header, then a stream of little-endian
+# records that are all RECORD_SIZE bytes, so a torn write can be cut off
+# without reading the rest of the file.
+#   start record: kind (written when a game starts)
+#   lock record:  kind, piece, rotation, column, drop type, lines cleared, tick (ms)
+#   end record:   kind, topped_out, tick (ms), utf-8 name (NUL padded)
+TELEMETRY_MAGIC = b"CTL2"
+PIECE_TYPES = "IOTSZLJ"
+DROP_GRAVITY, DROP_SOFT, DROP_HARD = 0, 1, 2
+REC_LOCK, REC_END, REC_START = 0, 1, 2
+RECORD_SIZE = 20
+NAME_BYTES = 14  # fits the 12 character name prompt
+LOCK_RECORD = struct.Struct("<BBBbBBI10x")
+END_RECORD = struct.Struct(f"<BBI{NAME_BYTES}s")
+START_RECORD = struct.Struct("<B19x")
 
 def generate_random_piece():
         """Generate a random Tetris piece positioned at spawn location.
@@ -348,6 +366,222 @@ def add_score(name, score, lines=0, level=1, top_n: int = 10, path: Path = HS_PA
     save_scores(scores, path)
     return scores
 
+def open_telemetry(path: Path = TELEMETRY_PATH, batch_size: int = 256) -> dict:
+    """Open the telemetry log for appending, start a new game and return a writer dict.
+
+    Records are packed into an in-memory buffer and only written to disk once
+    `batch_size` records are waiting (or on flush/close), so logging a lock
+    event during gameplay is just a struct.pack and a list append.
+
+    If an earlier run died halfway through writing a record, that partial
+    record is cut off first so new records stay aligned. A file that isn't a
+    telemetry log is moved aside to `<name>.bad` and a fresh log is started.
+    Raises OSError if the file can't be opened.
+    """
+    f = path.open("a+b")
+    try:
+        size = f.seek(0, 2)
+        f.seek(0)
+        if size and f.read(len(TELEMETRY_MAGIC)) != TELEMETRY_MAGIC:
+            f.close()
+            bad_path = path.with_name(path.name + ".bad")
+            path.replace(bad_path)
+            print(f"{path} is not a telemetry log, moved it to {bad_path}")
+            return open_telemetry(path, batch_size)
+        if size == 0:
+            f.write(TELEMETRY_MAGIC)
+        else:
+            body = size - len(TELEMETRY_MAGIC)
+            f.truncate(len(TELEMETRY_MAGIC) + body // RECORD_SIZE * RECORD_SIZE)
+        f.write(START_RECORD.pack(REC_START))
+        f.flush()
+    except Exception:
+        f.close()
+        raise
+    return {"file": f, "buffer": [], "batch_size": batch_size}
+
+def flush_telemetry(log: dict):
+    """Write any buffered records to disk.
+
+    If writing fails (full disk, file removed, ...) a warning is printed and
+    logging is turned off for the rest of the game instead of raising.
+    All the telemetry writers accept log=None (telemetry couldn't be opened)
+    and do nothing.
+    """
+    if log is None or log["file"] is None:
+        return
+    try:
+        if log["buffer"]:
+            log["file"].write(b"".join(log["buffer"]))
+        log["file"].flush()
+    except OSError as e:
+        print("Failed to write telemetry, logging disabled:", e)
+        try:
+            log["file"].close()
+        except OSError:
+            pass
+        log["file"] = None
+    log["buffer"].clear()
+
+def close_telemetry(log: dict):
+    """Flush buffered records and close the telemetry file."""
+    flush_telemetry(log)
+    if log is not None and log["file"] is not None:
+        log["file"].close()
+        log["file"] = None
+
+def log_lock_event(log: dict, piece: dict, drop_type: int, lines_cleared: int, tick: int):
+    """Append a lock event for `piece` to the telemetry buffer.
+
+    `tick` is the number of milliseconds since the game started.
+    """
+    if log is None or log["file"] is None:
+        return
+    log["buffer"].append(LOCK_RECORD.pack(
+        REC_LOCK,
+        PIECE_TYPES.index(piece["type"]),
+        piece.get("rotation_state", 0),
+        piece.get("origin_col", 0),
+        drop_type,
+        lines_cleared,
+        tick,
+    ))
+    if len(log["buffer"]) >= log["batch_size"]:
+        flush_telemetry(log)
+
+def log_game_end(log: dict, name: str, tick: int, topped_out: bool = True):
+    """Append an end-of-game record and flush the telemetry buffer.
+
+    The player's name is only known once the game is over, so the lock events
+    since the start record belong to `name`. Quit games use topped_out=False
+    and an empty name.
+    """
+    if log is None or log["file"] is None:
+        return
+    log["buffer"].append(END_RECORD.pack(REC_END, int(topped_out), tick, str(name).encode("utf-8")[:NAME_BYTES]))
+    flush_telemetry(log)
+
+def iter_telemetry(path: Path = TELEMETRY_PATH, chunk_records: int = 4096):
+    """Stream records from a telemetry log without loading the whole file.
+
+    Yields ("start",), ("lock", piece_type, rotation, column, drop_type,
+    lines_cleared, tick) and ("end", name, topped_out, tick) tuples. A missing
+    or empty file is an empty log. A partial record at the end of the file
+    (e.g. from a crash mid-write) is ignored; `open_telemetry` cuts it off
+    before anything else is appended. Raises ValueError on a bad header or a
+    record that can't be valid.
+    """
+    if not path.exists():
+        return
+    unpack_lock = LOCK_RECORD.unpack_from
+    unpack_end = END_RECORD.unpack_from
+    with path.open("rb") as f:
+        header = f.read(len(TELEMETRY_MAGIC))
+        if header == b"":
+            return
+        if header != TELEMETRY_MAGIC:
+            raise ValueError(f"{path} is not a telemetry log")
+        offset = len(TELEMETRY_MAGIC)
+        while True:
+            buf = f.read(RECORD_SIZE * chunk_records)
+            n = len(buf) - len(buf) % RECORD_SIZE
+            for pos in range(0, n, RECORD_SIZE):
+                kind = buf[pos]
+                if kind == REC_LOCK:
+                    _, p, rot, col, drop, lines, tick = unpack_lock(buf, pos)
+                    if p >= len(PIECE_TYPES) or rot > 3 or drop > DROP_HARD or lines > 4:
+                        raise ValueError(f"Corrupt telemetry lock record at offset {offset + pos} in {path}")
+                    yield ("lock", PIECE_TYPES[p], rot, col, drop, lines, tick)
+                elif kind == REC_END:
+                    _, topped_out, tick, name = unpack_end(buf, pos)
+                    if topped_out > 1:
+                        raise ValueError(f"Corrupt telemetry end record at offset {offset + pos} in {path}")
+                    # a name cut at NAME_BYTES may end mid-character, so drop the partial one
+                    yield ("end", name.rstrip(b"\0").decode("utf-8", "ignore"), bool(topped_out), tick)
+                elif kind == REC_START:
+                    yield ("start",)
+                else:
+                    raise ValueError(f"Unknown telemetry record kind {kind} at offset {offset + pos} in {path}")
+            if len(buf) < RECORD_SIZE * chunk_records:
+                break
+            offset += n
+
+def _new_rollup():
+    return {
+        "games": 0,
+        "pieces": 0,
+        "piece_counts": [0] * len(PIECE_TYPES),
+        "clear_counts": [0] * 5,  # index = lines cleared by the lock (0-4)
+        "play_ms": 0,
+        "top_outs": 0,
+        "top_out_ms": 0,
+    }
+
+def _add_game(rollup: dict, game: dict, tick: int, topped_out: bool):
+    rollup["games"] += 1
+    rollup["pieces"] += game["pieces"]
+    for i, n in enumerate(game["piece_counts"]):
+        rollup["piece_counts"][i] += n
+    for i, n in enumerate(game["clear_counts"]):
+        rollup["clear_counts"][i] += n
+    rollup["play_ms"] += tick
+    if topped_out:
+        rollup["top_outs"] += 1
+        rollup["top_out_ms"] += tick
+
+def _finish_rollup(rollup: dict) -> dict:
+    play_s = rollup["play_ms"] / 1000.0
+    return {
+        "games": rollup["games"],
+        "pieces": rollup["pieces"],
+        "piece_distribution": dict(zip(PIECE_TYPES, rollup["piece_counts"])),
+        "clear_types": {
+            "single": rollup["clear_counts"][1],
+            "double": rollup["clear_counts"][2],
+            "triple": rollup["clear_counts"][3],
+            "tetris": rollup["clear_counts"][4],
+        },
+        "pieces_per_second": rollup["pieces"] / play_s if play_s else 0.0,
+        "avg_top_out_seconds": rollup["top_out_ms"] / 1000.0 / rollup["top_outs"] if rollup["top_outs"] else 0.0,
+    }
+
+def rollup_telemetry(path: Path = TELEMETRY_PATH) -> dict:
+    """Build per-player and global statistics from a telemetry log.
+
+    Streams the log with `iter_telemetry`, so memory use stays constant no
+    matter how many events are stored. Returns a dict with keys 'global' and
+    'players' (name -> stats). Each stats dict has 'games', 'pieces',
+    'piece_distribution', 'clear_types', 'pieces_per_second' and
+    'avg_top_out_seconds'.
+
+    Games without an end record (crashed or killed) are left out entirely.
+    Games with no name (quit, or the window was closed at the name prompt)
+    only count towards 'global'.
+    """
+    total = _new_rollup()
+    players = {}
+    game = _new_rollup()
+    piece_index = {t: i for i, t in enumerate(PIECE_TYPES)}
+    for rec in iter_telemetry(path):
+        kind = rec[0]
+        if kind == "lock":
+            game["pieces"] += 1
+            game["piece_counts"][piece_index[rec[1]]] += 1
+            game["clear_counts"][rec[5]] += 1
+        elif kind == "start":
+            # drop locks from a game that never reached its end record
+            game = _new_rollup()
+        else:
+            _, name, topped_out, tick = rec
+            _add_game(total, game, tick, topped_out)
+            if name:
+                _add_game(players.setdefault(name, _new_rollup()), game, tick, topped_out)
+            game = _new_rollup()
+    return {
+        "global": _finish_rollup(total),
+        "players": {name: _finish_rollup(r) for name, r in players.items()},
+    }
+
 def get_user_input(screen, font, prompt="Enter name:", max_len: int = 10):
     """Simple wrapper that collects text input from the player and returns it.
 
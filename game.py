@@ -1,10 +1,22 @@
 #IMPORT STATEMENTS
 import pygame
-from functions import calculate_points, create_grid, draw_grid, generate_random_piece, piece_blocks_to_rects, can_move, check_lineclears, attempt_rotation, set_piece_blocks_from_origin, get_user_input, add_score
+from functions import calculate_points, create_grid, draw_grid, generate_random_piece, piece_blocks_to_rects, can_move, check_lineclears, attempt_rotation, set_piece_blocks_from_origin, get_user_input, add_score, open_telemetry, close_telemetry, log_lock_event, log_game_end, DROP_GRAVITY, DROP_SOFT, DROP_HARD
 
 """INITAL STATEMENTS"""
 
 def tetris(screen, screen_width, screen_height, clock, set_level=1):
+    """Play one game, logging it to the telemetry file when it can be opened."""
+    try:
+        telemetry = open_telemetry()
+    except OSError as e:
+        print("Failed to open telemetry, logging disabled:", e)
+        telemetry = None
+    try:
+        return play_tetris(screen, screen_width, screen_height, clock, telemetry, set_level)
+    finally:
+        close_telemetry(telemetry)
+
+def play_tetris(screen, screen_width, screen_height, clock, telemetry, set_level=1):
     # Create font for displaying text
     font = pygame.font.Font(None, 36)  # None = default font, 36 = size
 
@@ -23,6 +35,8 @@ def tetris(screen, screen_width, screen_height, clock, set_level=1):
     delay = 0.17
     delay_total = 0.0
     start_das_value = 0.0
+    game_ms = 0 # elapsed game time, used as the telemetry tick
+    game_over = False
     # create an initial random piece and convert its grid blocks to pixel rects
     current_piece = generate_random_piece()
     piece_rects = piece_blocks_to_rects(current_piece["blocks"], cell_size, grid_x, grid_y)
@@ -30,6 +44,8 @@ def tetris(screen, screen_width, screen_height, clock, set_level=1):
     while running:
         level = set_level+((total_lines)//10)
         for event in pygame.event.get():
+            if not running: # game ended earlier in this frame, ignore the rest of the queue
+                break
             if event.type == pygame.QUIT: #found this online in most everything? TODO cite this
                 running = False
             elif event.type == pygame.KEYDOWN:
@@ -72,6 +88,7 @@ def tetris(screen, screen_width, screen_height, clock, set_level=1):
                             for c, r in current_piece["blocks"]: occupied.add((c,r))
                             #check line clear and clear lines
                             lines_cleared = check_lineclears(occupied, cols, rows)
+                            log_lock_event(telemetry, current_piece, DROP_HARD, lines_cleared, game_ms)
                             if lines_cleared > 0:
                                 score += calculate_points(lines_cleared, level)
                                 total_lines += lines_cleared
@@ -82,6 +99,8 @@ def tetris(screen, screen_width, screen_height, clock, set_level=1):
                                     player_name = get_user_input(screen, font, prompt="Game Over! Enter your name:", max_len=12)
                                 except Exception:
                                     player_name = "PLAYER"
+                                log_game_end(telemetry, player_name, game_ms)
+                                game_over = True
                                 try:
                                     add_score(player_name, score, total_lines, level)
                                 except Exception as e:
@@ -139,6 +158,7 @@ def tetris(screen, screen_width, screen_height, clock, set_level=1):
 
                 # check line clear and clear lines
                 lines_cleared = check_lineclears(occupied, cols, rows)
+                log_lock_event(telemetry, current_piece, DROP_SOFT if soft_drop > 1 else DROP_GRAVITY, lines_cleared, game_ms)
                 if lines_cleared > 0:
                     score += calculate_points(lines_cleared, level)
                     total_lines += lines_cleared
@@ -150,6 +170,8 @@ def tetris(screen, screen_width, screen_height, clock, set_level=1):
                         player_name = get_user_input(screen, font, prompt="Game Over! Enter your name:", max_len=12)
                     except Exception:
                         player_name = "PLAYER"
+                    log_game_end(telemetry, player_name, game_ms)
+                    game_over = True
                     try:
                         add_score(player_name, score, total_lines, level)
                     except Exception as e:
@@ -182,7 +204,12 @@ def tetris(screen, screen_width, screen_height, clock, set_level=1):
         screen.blit(lines_text, (10, 90))
 
         pygame.display.flip()
-        et = clock.tick(30) /1000.0
+        frame_ms = clock.tick(30)
+        game_ms += frame_ms
+        et = frame_ms /1000.0
         fall_acc += et # adding up elasped time
 
+    # a game closed before topping out is still logged, under no name
+    if not game_over:
+        log_game_end(telemetry, "", game_ms, topped_out=False)
     return score, level, lines_cleared